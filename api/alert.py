@@ -13,61 +13,110 @@ POST /api/alert
 """
 
 import os
-import json
-from datetime import datetime
+import asyncio
+import threading
+from datetime import datetime, timezone
 from http.server import BaseHTTPRequestHandler
-import requests
+import httpx
+import orjson
+
+
+# Shared async client (keep-alive across warm invocations, retry on connect failures).
+# httpx connections are bound to the loop that opened them, so every request
+# runs on the same module-level loop rather than a fresh asyncio.run() loop.
+_LOOP = asyncio.new_event_loop()
+_LOOP_LOCK = threading.Lock()
+_HTTPX = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10),
+        # Connect-only retries: this replaces the requests Session's urllib3
+        # Retry(status_forcelist=[502, 503, 504], backoff_factor=0.2), and httpx
+        # never retries on a 5xx response, so Discord/Resend gateway errors are
+        # not retried. (urllib3's default allowed_methods excluded POST anyway,
+        # and re-POSTing after a 5xx risks a duplicate alert.)
+        retries=2
+    ),
+    timeout=10.0
+)
+
+
+# ============================================================================
+# Templates
+# ============================================================================
+
+# Discord embed color based on signal
+DISCORD_COLORS = {
+    'BUY': 0x22c55e,   # green
+    'SELL': 0xef4444,  # red
+    'WATCH': 0xf59e0b, # yellow
+    'HOLD': 0x6b7280   # gray
+}
+
+# Discord title emoji
+DISCORD_EMOJIS = {
+    'BUY': '🟢',
+    'SELL': '🔴',
+    'WATCH': '🟡',
+    'HOLD': '⚪'
+}
+
+# Email heading color (anything else falls back to yellow)
+EMAIL_COLORS = {
+    'BUY': '#22c55e',
+    'SELL': '#ef4444',
+}
+
+EMAIL_TEMPLATE = """
+    <div style="font-family: system-ui, sans-serif; max-width: 400px; margin: 0 auto; padding: 20px;">
+      <h2 style="color: {color};">
+        {signal} Signal: {ticker}
+      </h2>
+      <table style="width: 100%; border-collapse: collapse;">
+        <tr><td style="padding: 8px 0; border-bottom: 1px solid #eee;"><b>Momentum</b></td><td>{momentum}/100</td></tr>
+        <tr><td style="padding: 8px 0; border-bottom: 1px solid #eee;"><b>Sentiment</b></td><td>{sentiment}</td></tr>
+        <tr><td style="padding: 8px 0;"><b>Source</b></td><td>{source}</td></tr>
+      </table>
+      <p style="color: #666; font-size: 12px; margin-top: 20px;">TrendPulse • Not financial advice</p>
+    </div>
+    """
 
 
 # ============================================================================
 # Alert Senders
 # ============================================================================
 
-def send_discord(ticker: str, signal: str, momentum: int, sentiment: float, source: str = "reddit") -> bool:
-    """Send alert to Discord webhook."""
+async def send_discord(client: httpx.AsyncClient, ticker: str, signal: str, momentum: int, sentiment: float,
+                       source: str = "reddit", *, timestamp: str) -> bool:
+    """Send alert to Discord webhook. `timestamp` is the request's ISO-8601 UTC time."""
     webhook_url = os.environ.get('DISCORD_WEBHOOK_URL')
     if not webhook_url:
         return False
     
-    # Color based on signal
-    colors = {
-        'BUY': 0x22c55e,   # green
-        'SELL': 0xef4444,  # red
-        'WATCH': 0xf59e0b, # yellow
-        'HOLD': 0x6b7280   # gray
-    }
-    
-    # Emoji
-    emojis = {
-        'BUY': '🟢',
-        'SELL': '🔴', 
-        'WATCH': '🟡',
-        'HOLD': '⚪'
-    }
-    
     embed = {
-        "title": f"{emojis.get(signal, '📊')} {signal} Signal: {ticker}",
-        "color": colors.get(signal, 0x3b82f6),
+        "title": f"{DISCORD_EMOJIS.get(signal, '📊')} {signal} Signal: {ticker}",
+        "color": DISCORD_COLORS.get(signal, 0x3b82f6),
         "fields": [
             {"name": "Momentum", "value": f"{momentum}/100", "inline": True},
             {"name": "Sentiment", "value": f"{'+' if sentiment > 0 else ''}{int(sentiment * 100)}%", "inline": True},
             {"name": "Source", "value": source.capitalize(), "inline": True},
         ],
         "footer": {"text": "TrendPulse • Not financial advice"},
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": timestamp
     }
     
     payload = {"embeds": [embed]}
     
     try:
-        resp = requests.post(webhook_url, json=payload, timeout=10)
+        resp = await client.post(webhook_url, json=payload)
         return resp.status_code == 204
     except Exception as e:
         print(f"Discord error: {e}")
         return False
 
 
-def send_email(ticker: str, signal: str, momentum: int, sentiment: float, source: str = "reddit") -> bool:
+async def send_email(client: httpx.AsyncClient, ticker: str, signal: str, momentum: int, sentiment: float,
+                     source: str = "reddit") -> bool:
     """Send alert via Resend email API."""
     api_key = os.environ.get('RESEND_API_KEY')
     to_email = os.environ.get('ALERT_EMAIL')
@@ -77,19 +126,14 @@ def send_email(ticker: str, signal: str, momentum: int, sentiment: float, source
     
     sentiment_str = f"{'+' if sentiment > 0 else ''}{int(sentiment * 100)}%"
     
-    html = f"""
-    <div style="font-family: system-ui, sans-serif; max-width: 400px; margin: 0 auto; padding: 20px;">
-      <h2 style="color: {'#22c55e' if signal == 'BUY' else '#ef4444' if signal == 'SELL' else '#f59e0b'};">
-        {signal} Signal: {ticker}
-      </h2>
-      <table style="width: 100%; border-collapse: collapse;">
-        <tr><td style="padding: 8px 0; border-bottom: 1px solid #eee;"><b>Momentum</b></td><td>{momentum}/100</td></tr>
-        <tr><td style="padding: 8px 0; border-bottom: 1px solid #eee;"><b>Sentiment</b></td><td>{sentiment_str}</td></tr>
-        <tr><td style="padding: 8px 0;"><b>Source</b></td><td>{source.capitalize()}</td></tr>
-      </table>
-      <p style="color: #666; font-size: 12px; margin-top: 20px;">TrendPulse • Not financial advice</p>
-    </div>
-    """
+    html = EMAIL_TEMPLATE.format_map({
+        'color': EMAIL_COLORS.get(signal, '#f59e0b'),
+        'signal': signal,
+        'ticker': ticker,
+        'momentum': momentum,
+        'sentiment': sentiment_str,
+        'source': source.capitalize(),
+    })
     
     payload = {
         "from": "TrendPulse <alerts@resend.dev>",
@@ -99,11 +143,10 @@ def send_email(ticker: str, signal: str, momentum: int, sentiment: float, source
     }
     
     try:
-        resp = requests.post(
+        resp = await client.post(
             "https://api.resend.com/emails",
             headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-            json=payload,
-            timeout=10
+            json=payload
         )
         return resp.status_code == 200
     except Exception as e:
@@ -111,6 +154,21 @@ def send_email(ticker: str, signal: str, momentum: int, sentiment: float, source
         return False
 
 
+async def dispatch_alerts(channels: list, ticker: str, signal: str, momentum: int, sentiment: float,
+                          source: str, timestamp: str) -> dict:
+    """Send to all requested channels concurrently; returns {channel: sent}."""
+    coros = {}
+    
+    if 'discord' in channels:
+        coros['discord'] = send_discord(_HTTPX, ticker, signal, momentum, sentiment, source, timestamp=timestamp)
+    
+    if 'email' in channels:
+        coros['email'] = send_email(_HTTPX, ticker, signal, momentum, sentiment, source)
+    
+    results = await asyncio.gather(*coros.values())
+    return dict(zip(coros, results))
+
+
 # ============================================================================
 # Alert Logic
 # ============================================================================
@@ -145,10 +203,12 @@ def determine_signal(momentum: int, sentiment: float) -> str:
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
         try:
+            now_iso = datetime.now(timezone.utc).isoformat(timespec='seconds')
+            
             # Parse body
             content_length = int(self.headers.get('Content-Length', 0))
             body = self.rfile.read(content_length)
-            data = json.loads(body) if body else {}
+            data = orjson.loads(body) if body else {}
             
             ticker = data.get('ticker', 'UNKNOWN')
             momentum = data.get('momentum', 50)
@@ -164,37 +224,34 @@ class handler(BaseHTTPRequestHandler):
                 self.send_response(200)
                 self.send_header('Content-Type', 'application/json')
                 self.end_headers()
-                self.wfile.write(json.dumps({
+                self.wfile.write(orjson.dumps({
                     'sent': False,
                     'reason': 'Below alert threshold'
-                }).encode())
+                }))
                 return
             
-            # Send alerts
-            results = {}
-            
-            if 'discord' in channels:
-                results['discord'] = send_discord(ticker, signal, momentum, sentiment, source)
-            
-            if 'email' in channels:
-                results['email'] = send_email(ticker, signal, momentum, sentiment, source)
+            # Send alerts (in parallel, on the shared loop/client)
+            with _LOOP_LOCK:
+                results = _LOOP.run_until_complete(
+                    dispatch_alerts(channels, ticker, signal, momentum, sentiment, source, now_iso)
+                )
             
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.wfile.write(json.dumps({
+            self.wfile.write(orjson.dumps({
                 'sent': True,
                 'ticker': ticker,
                 'signal': signal,
                 'channels': results
-            }).encode())
+            }))
             
         except Exception as e:
             self.send_response(500)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode())
+            self.wfile.write(orjson.dumps({'error': str(e)}))
     
     def do_OPTIONS(self):
         self.send_response(200)
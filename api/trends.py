@@ -6,14 +6,22 @@ Returns momentum scores 0-100 for each ticker
 
 import os
 import re
-import json
-from datetime import datetime, timedelta
-from collections import defaultdict
+import threading
+import time
+from datetime import datetime, timezone
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain, count
 from http.server import BaseHTTPRequestHandler
 
+import ahocorasick
+import numpy as np
+import orjson
 import praw
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.parser import HTMLParser
 
 
 # ============================================================================
@@ -23,12 +31,8 @@ from bs4 import BeautifulSoup
 REDDIT_SUBREDDITS = ['wallstreetbets', 'cryptocurrency']
 POSTS_PER_SUB = 50  # hot + rising combined
 
-# Ticker regex
-TICKER_PATTERN = re.compile(r'\$([A-Z]{1,5})\b')
-TICKER_MENTION = re.compile(r'\b([A-Z]{2,5})\b')
-
 # Known tickers (validates uppercase words)
-KNOWN_TICKERS = {
+KNOWN_TICKERS = frozenset({
     # Stocks
     'NVDA', 'TSLA', 'AMD', 'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META',
     'GME', 'AMC', 'PLTR', 'SOFI', 'HOOD', 'COIN', 'MSTR', 'SPY', 'QQQ',
@@ -36,77 +40,112 @@ KNOWN_TICKERS = {
     # Crypto
     'BTC', 'ETH', 'SOL', 'DOGE', 'XRP', 'ADA', 'DOT', 'AVAX', 'MATIC',
     'LINK', 'SHIB', 'PEPE', 'BONK', 'WIF', 'ARB', 'OP', 'SUI', 'APT',
-}
+})
+
+# Ticker regex: one alternation of known tickers (longest first), optionally $-prefixed
+TICKER_PATTERN = re.compile(
+    r'(?<!\w)\$?(' + '|'.join(sorted(KNOWN_TICKERS, key=len, reverse=True)) + r')(?!\w)'
+)
+
+# Market keywords that flag a non-ticker trend as relevant
+TREND_KEYWORD_PATTERN = re.compile(r'stock|crypto|bitcoin|ethereum|\$', re.IGNORECASE)
 
 # Sentiment keywords
-BULLISH = {'moon', 'pump', 'bullish', 'buy', 'calls', 'long', 'squeeze', 'rocket', 'tendies', 'diamond', '🚀', '📈', '💎'}
-BEARISH = {'dump', 'crash', 'bearish', 'sell', 'puts', 'short', 'rekt', 'rug', '📉', '💀', '🐻'}
+BULLISH = frozenset({'moon', 'pump', 'bullish', 'buy', 'calls', 'long', 'squeeze', 'rocket', 'tendies', 'diamond', '🚀', '📈', '💎'})
+BEARISH = frozenset({'dump', 'crash', 'bearish', 'sell', 'puts', 'short', 'rekt', 'rug', '📉', '💀', '🐻'})
+
+# Single automaton over both keyword sets: one pass per post instead of one scan per keyword
+SENTIMENT_AUTOMATON = ahocorasick.Automaton()
+for _w in BULLISH:
+    SENTIMENT_AUTOMATON.add_word(_w, (1, _w))
+for _w in BEARISH:
+    SENTIMENT_AUTOMATON.add_word(_w, (-1, _w))
+SENTIMENT_AUTOMATON.make_automaton()
+
+
+# Shared HTTP session (keep-alive + retry on transient gateway errors)
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+))
 
 
 # ============================================================================
 # Reddit Scraper (PRAW)
 # ============================================================================
 
+# PRAW's Reddit instances aren't thread-safe: one client per worker thread.
+# Both live for the whole warm instance, so each worker authenticates once.
+_REDDIT_LOCAL = threading.local()
+_REDDIT_POOL = ThreadPoolExecutor(max_workers=4)
+
+
 def get_reddit_client():
-    """Initialize PRAW Reddit client."""
-    return praw.Reddit(
-        client_id=os.environ.get('REDDIT_CLIENT_ID'),
-        client_secret=os.environ.get('REDDIT_CLIENT_SECRET'),
-        username=os.environ.get('REDDIT_USERNAME'),
-        password=os.environ.get('REDDIT_PASSWORD'),
-        user_agent='TrendPulse/1.0'
-    )
+    """Return this thread's PRAW Reddit client, created once per thread."""
+    reddit = getattr(_REDDIT_LOCAL, 'reddit', None)
+    if reddit is None:
+        reddit = _REDDIT_LOCAL.reddit = praw.Reddit(
+            client_id=os.environ.get('REDDIT_CLIENT_ID'),
+            client_secret=os.environ.get('REDDIT_CLIENT_SECRET'),
+            username=os.environ.get('REDDIT_USERNAME'),
+            password=os.environ.get('REDDIT_PASSWORD'),
+            user_agent='TrendPulse/1.0'
+        )
+    return reddit
 
 
 def extract_tickers(text: str) -> list:
-    """Extract valid tickers from text."""
-    tickers = set()
-    
-    # $TICKER format
-    for match in TICKER_PATTERN.findall(text):
-        if match in KNOWN_TICKERS:
-            tickers.add(match)
-    
-    # Uppercase words (validate against known)
-    for match in TICKER_MENTION.findall(text):
-        if match in KNOWN_TICKERS:
-            tickers.add(match)
-    
-    return list(tickers)
+    """Extract valid tickers ($TICKER or bare uppercase) from text."""
+    return list(set(TICKER_PATTERN.findall(text)))
 
 
-def calc_sentiment(text: str) -> float:
-    """Calculate sentiment score -1 to 1."""
-    text_lower = text.lower()
-    bull = sum(1 for w in BULLISH if w in text_lower)
-    bear = sum(1 for w in BEARISH if w in text_lower)
+def calc_sentiment(text_lower: str) -> float:
+    """Calculate sentiment score -1 to 1 from already-lowercased text."""
+    # Each keyword counts once, however often it appears
+    matched = {hit for _, hit in SENTIMENT_AUTOMATON.iter(text_lower)}
+    bull = sum(1 for sign, _ in matched if sign > 0)
+    bear = len(matched) - bull
     total = bull + bear
     if total == 0:
         return 0.0
     return round((bull - bear) / total, 2)
 
 
-def fetch_reddit_data() -> dict:
-    """Fetch posts from Reddit and aggregate by ticker."""
+def _fetch(sub_name: str, kind: str) -> list:
+    """Fetch one listing ('hot' or 'rising') for a subreddit, on the calling thread's client."""
+    listing = getattr(get_reddit_client().subreddit(sub_name), kind)
+    return list(listing(limit=POSTS_PER_SUB // 2))
+
+
+def fetch_reddit_data() -> dict | None:
+    """Fetch posts from Reddit and aggregate by ticker (None if the fetch failed)."""
     try:
-        reddit = get_reddit_client()
-        ticker_data = defaultdict(lambda: {'mentions': 0, 'sentiment_sum': 0, 'scores': [], 'posts': 0, 'subreddit': ''})
+        ticker_data = defaultdict(lambda: {'mentions': 0, 'sentiment_sum': 0, 'score_sum': 0, 'score_count': 0, 'posts': 0, 'subreddit': ''})
+        
+        # Fetch hot + rising posts for every subreddit concurrently (I/O bound)
+        listings = {}
+        futures = {
+            _REDDIT_POOL.submit(_fetch, sub_name, kind): (sub_name, kind)
+            for sub_name in REDDIT_SUBREDDITS
+            for kind in ('hot', 'rising')
+        }
+        for future in as_completed(futures):
+            listings[futures[future]] = future.result()
         
+        # Aggregate single-threaded, in subreddit order
         for sub_name in REDDIT_SUBREDDITS:
-            subreddit = reddit.subreddit(sub_name)
-            
-            # Fetch hot + rising posts
-            posts = list(subreddit.hot(limit=POSTS_PER_SUB // 2)) + list(subreddit.rising(limit=POSTS_PER_SUB // 2))
-            
-            for post in posts:
+            for post in chain(listings[(sub_name, 'hot')], listings[(sub_name, 'rising')]):
                 text = f"{post.title} {post.selftext or ''}"
-                tickers = extract_tickers(text)
-                sentiment = calc_sentiment(text)
+                tickers = extract_tickers(text)  # case-sensitive: 'link' or 'sol' aren't tickers
+                sentiment = calc_sentiment(text.lower())
                 
                 for ticker in tickers:
                     ticker_data[ticker]['mentions'] += 1
                     ticker_data[ticker]['sentiment_sum'] += sentiment
-                    ticker_data[ticker]['scores'].append(post.score)
+                    ticker_data[ticker]['score_sum'] += post.score
+                    ticker_data[ticker]['score_count'] += 1
                     ticker_data[ticker]['posts'] += 1
                     ticker_data[ticker]['subreddit'] = sub_name
         
@@ -114,101 +153,116 @@ def fetch_reddit_data() -> dict:
     
     except Exception as e:
         print(f"Reddit error: {e}")
-        return {}
+        return None
 
 
 # ============================================================================
 # X/Twitter Trends Scraper (via trends24.in - no auth needed)
 # ============================================================================
 
-def fetch_twitter_trends() -> list:
-    """Scrape trending topics from trends24.in (mirrors Twitter trends)."""
+def fetch_twitter_trends() -> Counter | None:
+    """Scrape trends24.in (mirrors Twitter trends) and count by ticker (None if the fetch failed)."""
     try:
         # US trends
         url = "https://trends24.in/united-states/"
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
         
-        resp = requests.get(url, headers=headers, timeout=10)
-        resp.raise_for_status()
+        # Context manager hands the socket back to the pool even on error statuses
+        with SESSION.get(url, headers=headers, timeout=10) as resp:
+            resp.raise_for_status()
+            html = resp.text
         
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        trends = []
+        tree = HTMLParser(html)
+        counts = Counter()
         
         # Find trend list items
-        trend_cards = soup.select('.trend-card__list li a')
+        trend_cards = tree.css('.trend-card__list li a')
         
         for item in trend_cards[:30]:  # Top 30 trends
-            text = item.get_text(strip=True)
+            text = item.text(strip=True)
             if text:
                 # Check if it contains a ticker
                 tickers = extract_tickers(text.upper())
                 if tickers:
                     for ticker in tickers:
-                        trends.append({
-                            'ticker': ticker,
-                            'trend_text': text,
-                            'source': 'twitter'
-                        })
+                        counts[ticker] += 1
                 # Also check for crypto/stock keywords
-                elif any(kw in text.lower() for kw in ['stock', 'crypto', 'bitcoin', 'ethereum', '$']):
-                    trends.append({
-                        'ticker': text[:10],
-                        'trend_text': text,
-                        'source': 'twitter'
-                    })
+                elif TREND_KEYWORD_PATTERN.search(text):
+                    counts[text[:10]] += 1
         
-        return trends
+        return counts
     
     except Exception as e:
         print(f"Twitter trends error: {e}")
-        return []
+        return None
 
 
 # ============================================================================
 # Momentum Calculation
 # ============================================================================
 
-def calc_momentum(mentions: int, avg_score: float, sentiment: float) -> int:
+def calc_momentum(mentions: np.ndarray, avg_scores: np.ndarray, sentiments: np.ndarray) -> np.ndarray:
     """
-    Calculate momentum score 0-100.
+    Calculate momentum scores 0-100 for a batch of tickers at once.
     
     Factors:
     - Mention volume (log scaled, 40%)
     - Avg post score (log scaled, 30%)
     - Sentiment strength (30%)
     """
-    import math
-    
     # Mention score (0-40)
-    mention_score = min(40, math.log10(max(1, mentions)) * 20)
+    mention_score = np.minimum(40, np.log10(np.maximum(1, mentions)) * 20)
     
     # Score score (0-30)
-    score_score = min(30, math.log10(max(1, avg_score)) * 10)
+    score_score = np.minimum(30, np.log10(np.maximum(1, avg_scores)) * 10)
     
     # Sentiment score (0-30)
-    sentiment_score = (abs(sentiment) + 0.5) * 20  # Boost for strong sentiment
-    sentiment_score = min(30, sentiment_score)
+    sentiment_score = (np.abs(sentiments) + 0.5) * 20  # Boost for strong sentiment
+    sentiment_score = np.minimum(30, sentiment_score)
     
-    momentum = int(mention_score + score_score + sentiment_score)
-    return max(0, min(100, momentum))
+    momentum = (mention_score + score_score + sentiment_score).astype(np.int32)
+    return np.clip(momentum, 0, 100)
 
 
 # ============================================================================
 # Main Handler
 # ============================================================================
 
+def _keep_best(best: dict, seq: int, item: dict):
+    """Record (seq, item) under its ticker unless an entry with >= momentum exists."""
+    key = item['ticker'].upper().lstrip('$')
+    cur = best.get(key)
+    if cur is None or cur[1]['momentum'] < item['momentum']:
+        best[key] = (seq, item)
+
+
 def build_response():
     """Build the trends response combining Reddit and Twitter data."""
-    trends = []
+    return assemble_response(fetch_reddit_data(), fetch_twitter_trends())
+
+
+def assemble_response(reddit_data: dict | None, twitter_data: Counter | None) -> dict:
+    """Combine fetched Reddit and Twitter data; a failed (None) source counts as empty."""
+    reddit_data = reddit_data or {}
+    twitter_data = twitter_data or Counter()
+    
+    # Best (highest momentum) entry per ticker; first seen wins ties
+    best = {}
+    seq = count()
     
     # Reddit data
-    reddit_data = fetch_reddit_data()
-    for ticker, data in reddit_data.items():
-        avg_sentiment = data['sentiment_sum'] / max(1, data['mentions'])
-        avg_score = sum(data['scores']) / max(1, len(data['scores']))
-        momentum = calc_momentum(data['mentions'], avg_score, avg_sentiment)
-        
-        trends.append({
+    n = len(reddit_data)
+    mentions = np.fromiter((d['mentions'] for d in reddit_data.values()), dtype=np.int32, count=n)
+    avg_sentiments = np.fromiter(
+        (d['sentiment_sum'] / max(1, d['mentions']) for d in reddit_data.values()), dtype=np.float64, count=n
+    )
+    avg_scores = np.fromiter(
+        (d['score_sum'] / max(1, d['score_count']) for d in reddit_data.values()), dtype=np.float64, count=n
+    )
+    momentums = calc_momentum(mentions, avg_scores, avg_sentiments)
+    
+    for (ticker, data), momentum, avg_sentiment in zip(reddit_data.items(), momentums.tolist(), avg_sentiments.tolist()):
+        _keep_best(best, next(seq), {
             'ticker': f"${ticker}",
             'source': 'reddit',
             'momentum': momentum,
@@ -219,69 +273,79 @@ def build_response():
         })
     
     # Twitter trends
-    twitter_data = fetch_twitter_trends()
-    twitter_tickers = defaultdict(int)
-    for t in twitter_data:
-        twitter_tickers[t['ticker']] += 1
-    
-    for ticker, count in twitter_tickers.items():
+    for ticker, trend_count in twitter_data.items():
         # Twitter trends get moderate momentum (we don't have sentiment)
-        momentum = min(80, 30 + count * 10)
+        momentum = min(80, 30 + trend_count * 10)
         
         # Check if also on Reddit (boost)
         if ticker.replace('$', '') in reddit_data:
             momentum = min(95, momentum + 15)
         
-        trends.append({
+        _keep_best(best, next(seq), {
             'ticker': f"${ticker}" if not ticker.startswith('$') else ticker,
             'source': 'twitter',
             'momentum': momentum,
-            'mentions': count,
+            'mentions': trend_count,
             'sentiment': 0.1,  # Neutral-positive assumption for trending
             'subreddit': None,
             'posts': 0
         })
     
-    # Sort by momentum
-    trends.sort(key=lambda x: x['momentum'], reverse=True)
-    
-    # Dedupe by ticker (keep highest momentum)
-    seen = set()
-    unique_trends = []
-    for t in trends:
-        ticker = t['ticker'].upper()
-        if ticker not in seen:
-            seen.add(ticker)
-            unique_trends.append(t)
+    # Sort by momentum; ties keep the winning entries' insertion order
+    trends = [item for _, item in sorted(best.values(), key=lambda e: (-e[1]['momentum'], e[0]))]
     
     return {
-        'trends': unique_trends[:20],  # Top 20
-        'updated': datetime.utcnow().isoformat(),
+        'trends': trends[:20],  # Top 20
+        'updated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
         'sources': {
             'reddit': len(reddit_data),
-            'twitter': len(twitter_tickers)
+            'twitter': len(twitter_data)
         }
     }
 
 
+# Warm-instance response cache (matches the Cache-Control max-age below)
+CACHE_TTL = 60
+CACHE_TTL_DEGRADED = 5  # a fetcher failed; retry soon rather than serve the gap for a minute
+_CACHE = {'t': 0.0, 'ttl': 0, 'data': None}
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cached_response():
+    """Return build_response() output, rebuilding at most once per TTL."""
+    with _CACHE_LOCK:  # held during rebuild so concurrent misses don't stampede
+        now = time.monotonic()
+        if _CACHE['data'] is None or now - _CACHE['t'] >= _CACHE['ttl']:
+            reddit_data = fetch_reddit_data()
+            twitter_data = fetch_twitter_trends()
+            # Empty-but-successful results (e.g. no ticker trends on trends24) keep the full TTL
+            failed = reddit_data is None or twitter_data is None
+            _CACHE.update(
+                t=now,
+                ttl=CACHE_TTL_DEGRADED if failed else CACHE_TTL,
+                data=assemble_response(reddit_data, twitter_data)
+            )
+        return _CACHE['data']
+
+
 # Vercel serverless handler
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         try:
-            data = build_response()
+            data = get_cached_response()
             
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.send_header('Cache-Control', 'max-age=60')
             self.end_headers()
-            self.wfile.write(json.dumps(data).encode())
+            self.wfile.write(orjson.dumps(data))
         
         except Exception as e:
             self.send_response(500)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode())
+            self.wfile.write(orjson.dumps({'error': str(e)}))
     
     def do_OPTIONS(self):
         self.send_response(200)
@@ -1,30 +1,24 @@
 """
-TrendPulse - X/Twitter Selenium Scraper (LOCAL ONLY)
-====================================================
-Scrapes x.com/explore trends using headless Chrome.
+TrendPulse - X/Twitter Playwright Scraper (LOCAL ONLY)
+======================================================
+Scrapes x.com/explore trends using headless Chromium.
 Run locally, outputs JSON that can be used by the API.
 
 Usage:
     python scripts/scrape_x.py > x_trends.json
 
 Requirements:
-    pip install selenium webdriver-manager
+    pip install playwright
+    playwright install chromium
 
 Note: This runs LOCALLY only. Vercel uses trends24.in fallback.
 """
 
 import json
 import re
-import time
 from datetime import datetime
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 
 
 # Known tickers for validation
@@ -38,88 +32,80 @@ KNOWN_TICKERS = {
 
 TICKER_PATTERN = re.compile(r'\$([A-Z]{1,5})\b')
 
+# X uses various selectors, try multiple (in order of preference)
+TREND_SELECTORS = [
+    '[data-testid="trend"]',
+    '[data-testid="cellInnerDiv"]',
+    'div[aria-label*="Trending"]',
+    'section[aria-labelledby*="accessible"] div span'
+]
 
-def create_driver():
-    """Create headless Chrome driver."""
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-    
-    service = Service(ChromeDriverManager().install())
-    return webdriver.Chrome(service=service, options=options)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
 
 def scrape_x_explore():
     """Scrape x.com/explore for trending topics."""
-    driver = None
     trends = []
     
-    try:
-        driver = create_driver()
-        
-        # Go to explore page (no login required for trends)
-        driver.get('https://x.com/explore/tabs/trending')
-        
-        # Wait for trends to load
-        time.sleep(5)  # Allow JS to render
-        
-        # Try to find trend elements
-        # X uses various selectors, try multiple
-        selectors = [
-            '[data-testid="trend"]',
-            '[data-testid="cellInnerDiv"]',
-            'div[aria-label*="Trending"]',
-            'section[aria-labelledby*="accessible"] div span'
-        ]
-        
-        for selector in selectors:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    break
-            except:
-                continue
-        
-        # Extract text from trend elements
-        seen = set()
-        for elem in elements[:50]:
+    with sync_playwright() as p:
+        browser = None
+        try:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page(user_agent=USER_AGENT, viewport={'width': 1920, 'height': 1080})
+            
+            # Go to explore page (no login required for trends)
+            page.goto('https://x.com/explore/tabs/trending')
+            
+            # Wait only until trend cells render (instead of a fixed sleep)
             try:
-                text = elem.text.strip()
-                if not text or text in seen:
-                    continue
-                seen.add(text)
-                
-                # Look for tickers
-                for match in TICKER_PATTERN.findall(text.upper()):
-                    if match in KNOWN_TICKERS:
+                page.wait_for_selector(TREND_SELECTORS[0], timeout=8000)
+                elements = page.query_selector_all(TREND_SELECTORS[0])
+            except PlaywrightTimeout:
+                # Trend cells never showed up; fall back to the generic selectors
+                print(f"Timed out waiting for {TREND_SELECTORS[0]}, trying fallbacks",
+                      file=__import__('sys').stderr)
+                elements = []
+                for selector in TREND_SELECTORS[1:]:
+                    elements = page.query_selector_all(selector)
+                    if elements:
+                        break
+            
+            # Extract text from trend elements
+            seen = set()
+            for elem in elements[:50]:
+                try:
+                    text = elem.inner_text().strip()
+                    if not text or text in seen:
+                        continue
+                    seen.add(text)
+                    
+                    # Look for tickers
+                    for match in TICKER_PATTERN.findall(text.upper()):
+                        if match in KNOWN_TICKERS:
+                            trends.append({
+                                'ticker': f'${match}',
+                                'text': text[:100],
+                                'source': 'twitter'
+                            })
+                    
+                    # Check for crypto/stock keywords
+                    keywords = ['bitcoin', 'ethereum', 'crypto', 'stock', 'trading', 'btc', 'eth']
+                    if any(kw in text.lower() for kw in keywords):
                         trends.append({
-                            'ticker': f'${match}',
+                            'ticker': text.split()[0][:10],
                             'text': text[:100],
                             'source': 'twitter'
                         })
-                
-                # Check for crypto/stock keywords
-                keywords = ['bitcoin', 'ethereum', 'crypto', 'stock', 'trading', 'btc', 'eth']
-                if any(kw in text.lower() for kw in keywords):
-                    trends.append({
-                        'ticker': text.split()[0][:10],
-                        'text': text[:100],
-                        'source': 'twitter'
-                    })
-                    
-            except Exception as e:
-                continue
+                        
+                except Exception as e:
+                    continue
+            
+        except Exception as e:
+            print(f"Error: {e}", file=__import__('sys').stderr)
         
-    except Exception as e:
-        print(f"Error: {e}", file=__import__('sys').stderr)
-    
-    finally:
-        if driver:
-            driver.quit()
+        finally:
+            if browser:
+                browser.close()
     
     return trends
 
@@ -0,0 +1,88 @@
+"""Smoke tests for api/trends.py with the network fetchers stubbed out."""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'api'))
+
+import trends  # noqa: E402
+
+
+def _reddit(mentions, score_sum, sentiment_sum=0.0, subreddit='wallstreetbets'):
+    return {
+        'mentions': mentions,
+        'sentiment_sum': sentiment_sum,
+        'score_sum': score_sum,
+        'score_count': mentions,
+        'posts': mentions,
+        'subreddit': subreddit,
+    }
+
+
+def test_build_response_empty_sources(monkeypatch):
+    monkeypatch.setattr(trends, 'fetch_reddit_data', lambda: {})
+    monkeypatch.setattr(trends, 'fetch_twitter_trends', lambda: Counter())
+
+    data = trends.build_response()
+
+    assert data['trends'] == []
+    assert data['sources'] == {'reddit': 0, 'twitter': 0}
+
+
+def test_build_response_merges_and_ranks(monkeypatch):
+    monkeypatch.setattr(trends, 'fetch_reddit_data', lambda: {
+        'NVDA': _reddit(mentions=10, score_sum=10_000, sentiment_sum=5.0),
+        'AMD': _reddit(mentions=1, score_sum=1),
+    })
+    monkeypatch.setattr(trends, 'fetch_twitter_trends', lambda: Counter({'AMD': 4, 'Bitcoin': 1}))
+
+    data = trends.build_response()
+    by_ticker = {t['ticker']: t for t in data['trends']}
+
+    # Twitter AMD (30 + 4*10, +15 reddit boost = 85) beats the weak reddit AMD entry
+    assert by_ticker['$AMD']['source'] == 'twitter'
+    assert by_ticker['$AMD']['momentum'] == 85
+    assert by_ticker['$NVDA']['source'] == 'reddit'
+    assert by_ticker['$Bitcoin']['mentions'] == 1
+    assert [t['momentum'] for t in data['trends']] == sorted((t['momentum'] for t in data['trends']), reverse=True)
+    assert data['sources'] == {'reddit': 2, 'twitter': 2}
+
+
+def test_build_response_tie_keeps_winner_insertion_order(monkeypatch):
+    # reddit AMD=10, reddit NVDA=55, twitter AMD=55 (40 + reddit boost): NVDA's winner came first
+    monkeypatch.setattr(trends, 'fetch_reddit_data', lambda: {
+        'AMD': _reddit(mentions=1, score_sum=1),
+        'NVDA': _reddit(mentions=10, score_sum=1_000, sentiment_sum=2.5),
+    })
+    monkeypatch.setattr(trends, 'fetch_twitter_trends', lambda: Counter({'AMD': 1}))
+
+    data = trends.build_response()
+
+    assert [(t['ticker'], t['momentum']) for t in data['trends']] == [('$NVDA', 55), ('$AMD', 55)]
+
+
+def _reset_cache(monkeypatch):
+    monkeypatch.setattr(trends, '_CACHE', {'t': 0.0, 'ttl': 0, 'data': None})
+
+
+def test_cache_keeps_full_ttl_when_sources_are_just_empty(monkeypatch):
+    _reset_cache(monkeypatch)
+    monkeypatch.setattr(trends, 'fetch_reddit_data', lambda: {'NVDA': _reddit(mentions=3, score_sum=300)})
+    monkeypatch.setattr(trends, 'fetch_twitter_trends', lambda: Counter())
+
+    data = trends.get_cached_response()
+
+    assert data['sources'] == {'reddit': 1, 'twitter': 0}
+    assert trends._CACHE['ttl'] == trends.CACHE_TTL
+
+
+def test_cache_shortens_ttl_when_a_fetch_fails(monkeypatch):
+    _reset_cache(monkeypatch)
+    monkeypatch.setattr(trends, 'fetch_reddit_data', lambda: None)
+    monkeypatch.setattr(trends, 'fetch_twitter_trends', lambda: Counter({'BTC': 2}))
+
+    data = trends.get_cached_response()
+
+    assert data['sources'] == {'reddit': 0, 'twitter': 1}
+    assert trends._CACHE['ttl'] == trends.CACHE_TTL_DEGRADED